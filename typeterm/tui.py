@@ -4,12 +4,29 @@ import argparse
 import curses
 import random
 import time
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
 
 from .wordlist import generate_words, load_words_from_file, WORDS as DEFAULT_WORDS
 
+# Cached color attributes; filled in once by _init_colors() after curses starts.
+CORRECT_ATTR = 0
+WRONG_ATTR = 0
+CUR_ATTR = curses.A_UNDERLINE
 
-@dataclass
+# Keystroke classes for handle_key, indexed by key code (0-255)
+_KEY_NONE, _KEY_BACKSPACE, _KEY_SUBMIT, _KEY_CHAR = range(4)
+_KEY_DISPATCH = [_KEY_NONE] * 256
+for _c in range(33, 127):  # printable ascii; space submits
+    _KEY_DISPATCH[_c] = _KEY_CHAR
+for _c in (127, 8):
+    _KEY_DISPATCH[_c] = _KEY_BACKSPACE
+for _c in (10, 13, 32):
+    _KEY_DISPATCH[_c] = _KEY_SUBMIT
+del _c
+
+
+@dataclass(slots=True)
 class Config:
     mode: str = "time"  # "time" or "words"
     seconds: int = 60
@@ -18,41 +35,61 @@ class Config:
     wordlist_path: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WordState:
     target: str
-    typed: str = ""
-
-    @property
-    def correct_prefix_length(self) -> int:
-        n = 0
-        for a, b in zip(self.typed, self.target):
-            if a == b:
-                n += 1
-            else:
-                break
-        return n
+    typed: bytearray = field(default_factory=bytearray)  # ASCII keystrokes, see handle_key
+    correct_len: int = 0  # length of the correctly typed prefix, maintained by handle_key
+    first_wrong: int | None = None  # index of the first mistyped char, if any
+    target_b: bytes = field(init=False, repr=False)  # target as bytes, for comparing with typed
 
-    @property
-    def extra_count(self) -> int:
-        return max(0, len(self.typed) - len(self.target))
+    def __post_init__(self):
+        self.target_b = _target_bytes(self.target)
 
-    @property
-    def is_complete(self) -> bool:
-        # complete when user pressed space or reached exact length and pressed space/enter handled by app
-        return False
+    def reset(self, target: str) -> None:
+        # reuse this instance for a new target word
+        self.target = target
+        self.target_b = _target_bytes(target)
+        self.typed.clear()
+        self.correct_len = 0
+        self.first_wrong = None
+
+
+def _target_bytes(target: str) -> bytes:
+    try:
+        return target.encode("ascii")
+    except UnicodeEncodeError:
+        # non-ASCII chars can't be typed; map them to a byte no keystroke produces
+        return bytes(ord(c) if c.isascii() else 0 for c in target)
 
 
 class TypingSession:
     def __init__(self, cfg: Config):
         self.cfg = cfg
-        nwords = max(cfg.words, 200) if cfg.mode == "time" else cfg.words
-        # choose word pool
-        if cfg.wordlist_path:
-            pool = load_words_from_file(cfg.wordlist_path)
-        else:
-            pool = DEFAULT_WORDS
-        self.words: list[WordState] = [WordState(w) for w in generate_words(nwords, seed=cfg.seed, word_source=pool)]
+        # choose word pool once; _extend_words and reset reuse it
+        self._pool = load_words_from_file(cfg.wordlist_path) if cfg.wordlist_path else DEFAULT_WORDS
+        # static parts of the header line, around the remaining seconds/words count
+        self._hdr_prefix = f"Mode: {cfg.mode.upper()} | "
+        self._hdr_suffix = "s left | ESC quit, TAB restart" if cfg.mode == "time" else " words left | ESC quit, TAB restart"
+        self._area: tuple[int, int, int] = (0, 0, 0)  # (start_y, x, width) of the words area
+        # Word layout, independent of scrolling; extended lazily as words are added
+        self._layout_width: int | None = None
+        self._positions: list[tuple[int, int, int]] = []  # (word_index, line, x)
+        self._line_offsets: list[int] = []  # index of the first word on each line
+        self._line_texts: list[str] = []  # space-joined targets of each line
+        self.words: list[WordState] = []
+        self.reset()
+
+    def reset(self) -> None:
+        # Start a new test with fresh words, reusing the existing WordState objects.
+        nwords = max(self.cfg.words, 200) if self.cfg.mode == "time" else self.cfg.words
+        # one generator per test so extensions continue the seeded sequence
+        self._rng = random.Random(self.cfg.seed)
+        targets = generate_words(nwords, word_source=self._pool, rng=self._rng)
+        del self.words[nwords:]
+        for word, target in zip(self.words, targets):
+            word.reset(target)
+        self.words.extend(WordState(w) for w in targets[len(self.words):])
         self.index = 0
         self.view_start = 0  # index of first visible word for layout/scrolling
         self.started_at: float | None = None
@@ -61,12 +98,20 @@ class TypingSession:
         self.correct_chars = 0
         self.incorrect_chars = 0
         self.completed_words = 0
+        # Redraw bookkeeping for render(): what changed since the last frame
+        self._dirty_all = True
+        self._dirty_header = True
+        self._dirty_current_word = True
+        self._last_second: int | None = None  # whole seconds elapsed at the last header update
+        self._screen_size: tuple[int, int] | None = None
+        self._visible: list[tuple[int, int, int]] = []  # (word_index, rel_y, rel_x) last drawn
+        self._invalidate_layout()
 
     # Metrics
     def elapsed(self) -> float:
         if self.started_at is None:
             return 0.0
-        end = self.ended_at if self.ended_at is not None else time.time()
+        end = self.ended_at if self.ended_at is not None else time.monotonic()
         return max(0.0, end - self.started_at)
 
     def is_running(self) -> bool:
@@ -75,10 +120,12 @@ class TypingSession:
     def is_finished(self) -> bool:
         return self.ended_at is not None
 
-    def remaining_seconds(self) -> int:
+    def remaining_seconds(self, elapsed: float | None = None) -> int:
         if self.cfg.mode != "time":
             return 0
-        secs = self.cfg.seconds - int(self.elapsed())
+        if elapsed is None:
+            elapsed = self.elapsed()
+        secs = self.cfg.seconds - int(elapsed)
         return max(0, secs)
 
     def current_word(self) -> WordState:
@@ -88,56 +135,123 @@ class TypingSession:
         if self.is_finished():
             return
         if self.started_at is None:
-            self.started_at = time.time()
-        # printable range
-        if ch in (curses.KEY_BACKSPACE, 127, 8):
-            if self.current_word().typed:
-                self.current_word().typed = self.current_word().typed[:-1]
+            self.started_at = time.monotonic()
+            self._dirty_all = True
+        self._dirty_header = True
+        self._dirty_current_word = True
+        if 0 <= ch < 256:
+            kind = _KEY_DISPATCH[ch]
+        else:
+            kind = _KEY_BACKSPACE if ch == curses.KEY_BACKSPACE else _KEY_NONE
+        if kind == _KEY_CHAR:
+            word = self.current_word()
+            i = len(word.typed)
+            # count correct and incorrect chars as they are typed
+            if i < len(word.target_b) and ch == word.target_b[i]:
+                self.correct_chars += 1
+                if word.first_wrong is None:
+                    word.correct_len += 1
+            else:
+                self.incorrect_chars += 1
+                if word.first_wrong is None:
+                    word.first_wrong = i
+            word.typed.append(ch)
+            self.total_keystrokes += 1
+        elif kind == _KEY_BACKSPACE:
+            word = self.current_word()
+            if word.typed:
+                n = len(word.typed) - 1
+                # undo the accounting done when this char was typed
+                if n < len(word.target_b) and word.typed[n] == word.target_b[n]:
+                    self.correct_chars -= 1
+                else:
+                    self.incorrect_chars -= 1
+                del word.typed[n:]
+                if word.first_wrong is None or n <= word.first_wrong:
+                    word.first_wrong = None
+                    word.correct_len = n
                 self.total_keystrokes += 1
-            return
-        if ch in (10, 13, ord(' ')):
+        elif kind == _KEY_SUBMIT:
             self._submit_word()
-            return
-        if 32 <= ch <= 126:
-            # ascii
-            self.current_word().typed += chr(ch)
-            self.total_keystrokes += 1
-            return
 
     def _submit_word(self) -> None:
-        target = self.current_word().target
+        target = self.current_word().target_b
         typed = self.current_word().typed
-        # count correct and incorrect chars for this word
-        for i, c in enumerate(typed):
-            if i < len(target) and c == target[i]:
-                self.correct_chars += 1
-            else:
-                self.incorrect_chars += 1
+        # typed chars were already counted by handle_key;
         # count missed characters as incorrect if typed shorter than target (on submission)
         if len(typed) < len(target):
             self.incorrect_chars += (len(target) - len(typed))
         self.completed_words += 1
+        self._dirty_all = True
         # move index
         self.index += 1
         if self.cfg.mode == "words" and self.completed_words >= self.cfg.words:
-            self.ended_at = time.time()
+            self.ended_at = time.monotonic()
         elif self.index >= len(self.words):
             # extend for time mode so there's always more words
             self._extend_words()
 
     def _extend_words(self):
         # Extend from same source (either external wordlist or default)
-        pool = load_words_from_file(self.cfg.wordlist_path) if self.cfg.wordlist_path else DEFAULT_WORDS
-        more = generate_words(100, seed=None, word_source=pool)
+        more = generate_words(100, word_source=self._pool, rng=self._rng)
         self.words.extend(WordState(w) for w in more)
 
-    def tick(self):
-        if self.cfg.mode == "time" and self.is_running():
-            if self.elapsed() >= self.cfg.seconds:
-                self.ended_at = time.time()
+    def _invalidate_layout(self) -> None:
+        # Called on terminal resize or new words; the next frame lays words out again from scratch.
+        self._layout_width = None
+        self._positions = []
+        self._line_offsets = []
+        self._line_texts = []
+        self._dirty_all = True
+
+    def _layout(self, width: int) -> None:
+        # Position any words not laid out yet; a new width starts over.
+        if width != self._layout_width:
+            self._layout_width = width
+            self._positions = []
+            self._line_offsets = []
+            self._line_texts = []
+        positions = self._positions
+        if positions:
+            idx, y, x0 = positions[-1]
+            x0 += len(self.words[idx].target)
+        else:
+            y = 0
+            x0 = 0
+        texts = self._line_texts
+        for idx in range(len(positions), len(self.words)):
+            target = self.words[idx].target
+            n = len(target)
+            if x0 > 0 and x0 + 1 + n > width:
+                y += 1
+                x0 = 0
+            elif x0 > 0:
+                x0 += 1
+            if x0 == 0:
+                self._line_offsets.append(idx)
+                texts.append(target)
+            else:
+                texts[-1] += " " + target
+            positions.append((idx, y, x0))
+            x0 += n
 
-    def wpm(self) -> float:
-        elapsed = max(self.elapsed(), 1e-9)
+    def tick(self):
+        if not self.is_running():
+            return
+        now = time.monotonic()
+        # the header only shows whole seconds; repaint it when the second rolls over
+        second = int(now - self.started_at)
+        if second != self._last_second:
+            self._last_second = second
+            self._dirty_header = True
+        if self.cfg.mode == "time" and now - self.started_at >= self.cfg.seconds:
+            self.ended_at = now
+            self._dirty_all = True
+
+    def wpm(self, elapsed: float | None = None) -> float:
+        if elapsed is None:
+            elapsed = self.elapsed()
+        elapsed = max(elapsed, 1e-9)
         return (self.correct_chars / 5.0) / (elapsed / 60.0)
 
     def accuracy(self) -> float:
@@ -153,10 +267,8 @@ def draw_centered(stdscr, y: int, text: str, attr=0):
     stdscr.addnstr(y, x, text, max(0, w - x), attr)
 
 
-def render(session: TypingSession, stdscr):
-    stdscr.erase()
-    h, w = stdscr.getmaxyx()
-    # Colors
+def _init_colors():
+    global CORRECT_ATTR, WRONG_ATTR, CUR_ATTR
     try:
         curses.start_color()
         curses.use_default_colors()
@@ -165,129 +277,170 @@ def render(session: TypingSession, stdscr):
         curses.init_pair(3, curses.COLOR_CYAN, -1)   # highlight
     except curses.error:
         pass
+    CORRECT_ATTR = curses.color_pair(1)
+    WRONG_ATTR = curses.color_pair(2)
+    CUR_ATTR = curses.A_UNDERLINE | curses.color_pair(3)
 
-    # Header
-    mode_text = f"Mode: {session.cfg.mode.upper()}"
-    if session.cfg.mode == "time":
-        hdr = f"{mode_text} | {session.remaining_seconds():02d}s left | ESC quit, TAB restart"
+
+def render(session: TypingSession, stdscr):
+    h, w = stdscr.getmaxyx()
+    if not (session._dirty_all or session._dirty_header or session._dirty_current_word) and session._screen_size == (h, w):
+        return  # nothing changed since the last frame
+    elapsed = session.elapsed()  # one clock read per frame
+    if session._dirty_all or session._screen_size != (h, w):
+        render_full(session, stdscr, h, w, elapsed)
     else:
-        remaining_words = max(0, session.cfg.words - session.completed_words)
-        hdr = f"{mode_text} | {remaining_words} words left | ESC quit, TAB restart"
-    stdscr.addnstr(0, 1, hdr, w - 2, curses.A_BOLD)
+        # Only the clock or the current word changed since the last frame
+        if session._dirty_header:
+            draw_header(session, stdscr, w, elapsed)
+        if session._dirty_current_word and session.is_running():
+            draw_current_line(session, stdscr)
+    session._screen_size = (h, w)
+    session._dirty_all = session._dirty_header = session._dirty_current_word = False
+    stdscr.refresh()
 
-    # Stats line
-    stats = f"WPM: {session.wpm():.1f} | Acc: {session.accuracy():.0f}% | Time: {int(session.elapsed()):02d}s"
-    stdscr.addnstr(1, 1, stats, w - 2)
+
+def render_full(session: TypingSession, stdscr, h: int, w: int, elapsed: float):
+    stdscr.erase()
+    draw_header(session, stdscr, w, elapsed)
 
     # Instructions if not started
     if session.started_at is None:
         draw_centered(stdscr, h // 2, "Start typing to begin...", curses.A_DIM)
     elif session.is_finished():
         # Results screen
-        draw_centered(stdscr, h // 2 - 1, f"Results — WPM {session.wpm():.1f} | Acc {session.accuracy():.0f}%", curses.A_BOLD)
+        draw_centered(stdscr, h // 2 - 1, f"Results — WPM {session.wpm(elapsed):.1f} | Acc {session.accuracy():.0f}%", curses.A_BOLD)
         draw_centered(stdscr, h // 2 + 1, "Press TAB to restart or ESC to quit", curses.A_DIM)
     else:
         # Typing area
         draw_words_area(session, stdscr, start_y=3, height=h - 4, width=w - 2, x=1)
 
-    stdscr.refresh()
+
+def draw_header(session: TypingSession, stdscr, w: int, elapsed: float):
+    # Header
+    if session.cfg.mode == "time":
+        hdr = f"{session._hdr_prefix}{session.remaining_seconds(elapsed):02d}{session._hdr_suffix}"
+    else:
+        remaining_words = max(0, session.cfg.words - session.completed_words)
+        hdr = f"{session._hdr_prefix}{remaining_words}{session._hdr_suffix}"
+    stdscr.move(0, 0)
+    stdscr.clrtoeol()
+    stdscr.addnstr(0, 1, hdr, w - 2, curses.A_BOLD)
+
+    # Stats line
+    stats = f"WPM: {session.wpm(elapsed):.1f} | Acc: {session.accuracy():.0f}% | Time: {int(elapsed):02d}s"
+    stdscr.move(1, 0)
+    stdscr.clrtoeol()
+    stdscr.addnstr(1, 1, stats, w - 2)
 
 
 def draw_words_area(session: TypingSession, stdscr, start_y: int, height: int, width: int, x: int):
     # We keep previous words visible and only scroll when the current word would move beyond the view.
-
-    def layout(start_idx: int):
-        positions: list[tuple[int, int, int]] = []  # (word_index, y, x)
-        y = 0
-        x0 = 0
-        idx = start_idx
-        current_line = None
-        while y < height and idx < len(session.words):
-            w = session.words[idx].target
-            need_space = 1 if x0 > 0 else 0
-            if x0 + need_space + len(w) > width:
-                y += 1
-                x0 = 0
-                if y >= height:
-                    break
-                need_space = 0
-            if need_space:
-                x0 += 1
-            positions.append((idx, y, x0))
-            if idx == session.index:
-                current_line = y
-            x0 += len(w)
-            idx += 1
-        return positions, current_line
-
-    # Adjust view_start so that the current word is within the visible area.
-    start_idx = session.view_start
-    for _ in range(1000):
-        positions, cur_line = layout(start_idx)
-        if cur_line is not None and cur_line < height:
-            break
-        start_idx += 1
-    session.view_start = start_idx
+    session._area = (start_y, x, width)
+    session._visible = []
+    if height <= 0 or width <= 0:
+        return
+    session._layout(width)
+    offsets = session._line_offsets
+
+    # Adjust view_start so that the current word's line is within the visible area.
+    cur_line = bisect_right(offsets, session.index) - 1
+    top = bisect_right(offsets, session.view_start) - 1
+    if cur_line >= top + height:
+        top = cur_line - height + 1
+    elif cur_line < top:
+        top = cur_line
+    session.view_start = offsets[top]
+    end = offsets[top + height] if top + height < len(offsets) else len(session.words)
 
     # Draw the positioned words
-    positions, _ = layout(session.view_start)
-    for idx, rel_y, rel_x in positions:
-        word = session.words[idx]
-        abs_y = start_y + rel_y
-        abs_x = x + rel_x
-        if idx == session.index:
-            draw_word_with_progress(stdscr, abs_y, abs_x, word)
-        else:
-            if idx < session.index and word.typed:
-                draw_word_result(stdscr, abs_y, abs_x, word)
-            else:
-                stdscr.addnstr(abs_y, abs_x, word.target, max(0, x + width - abs_x))
+    session._visible = [(idx, y - top, rel_x) for idx, y, rel_x in session._positions[session.view_start:end]]
+    cur_rel_y = cur_line - top
+    for idx, rel_y, rel_x in session._visible:
+        if rel_y <= cur_rel_y:
+            draw_word(session, stdscr, idx, start_y + rel_y, x + rel_x, x + width)
+        elif rel_x == 0:
+            # lines below the current one are untyped: draw each in one call
+            stdscr.addnstr(start_y + rel_y, x, session._line_texts[top + rel_y], width)
+
+
+def draw_current_line(session: TypingSession, stdscr):
+    # Repaint just the line holding the current word; extra typed chars may spill over its neighbours.
+    start_y, x, width = session._area
+    cur_y = next((rel_y for idx, rel_y, _ in session._visible if idx == session.index), None)
+    if cur_y is None:
+        return
+    stdscr.move(start_y + cur_y, x)
+    stdscr.clrtoeol()
+    for idx, rel_y, rel_x in session._visible:
+        if rel_y == cur_y:
+            draw_word(session, stdscr, idx, start_y + rel_y, x + rel_x, x + width)
+
+
+def draw_word(session: TypingSession, stdscr, idx: int, abs_y: int, abs_x: int, right: int):
+    word = session.words[idx]
+    if idx == session.index:
+        draw_word_with_progress(stdscr, abs_y, abs_x, word)
+    elif idx < session.index and word.typed:
+        draw_word_result(stdscr, abs_y, abs_x, word)
+    else:
+        stdscr.addnstr(abs_y, abs_x, word.target, max(0, right - abs_x))
+
+
+def draw_marked(stdscr, y: int, x: int, word: WordState, start: int, end: int):
+    # draw target[start:end] green/red against typed, one addnstr per run of equal color
+    target = word.target
+    target_b = word.target_b
+    typed = word.typed
+    i = start
+    while i < end:
+        ok = typed[i] == target_b[i]
+        j = i + 1
+        while j < end and (typed[j] == target_b[j]) == ok:
+            j += 1
+        stdscr.addnstr(y, x + i, target[i:j], j - i, CORRECT_ATTR if ok else WRONG_ATTR)
+        i = j
 
 
 def draw_word_with_progress(stdscr, y: int, x: int, word: WordState):
-    correct_attr = curses.color_pair(1)
-    wrong_attr = curses.color_pair(2)
-    cur_attr = curses.A_UNDERLINE | curses.color_pair(3)
-    # draw each char
-    for i, ch in enumerate(word.target):
-        if i < len(word.typed):
-            if word.typed[i] == ch:
-                stdscr.addch(y, x + i, ord(ch), correct_attr)
-            else:
-                stdscr.addch(y, x + i, ord(ch), wrong_attr)
-        else:
-            stdscr.addch(y, x + i, ord(ch), cur_attr)
+    target = word.target
+    typed = word.typed
+    n = min(len(typed), len(target))
+    # correct prefix in one call
+    k = word.correct_len
+    if k:
+        stdscr.addnstr(y, x, target, k, CORRECT_ATTR)
+    # typed chars after the first mistake
+    draw_marked(stdscr, y, x, word, k, n)
+    # untyped remainder in one call
+    if n < len(target):
+        stdscr.addnstr(y, x + n, target[n:], len(target) - n, CUR_ATTR)
     # Extra typed chars beyond target
-    extra = word.extra_count
-    for j in range(extra):
-        ch = word.typed[len(word.target) + j]
-        stdscr.addch(y, x + len(word.target) + j, ord(ch), wrong_attr)
+    extra = len(typed) - len(target)
+    if extra > 0:
+        stdscr.addnstr(y, x + len(target), typed[len(target):].decode("ascii"), extra, WRONG_ATTR)
 
 
 def draw_word_result(stdscr, y: int, x: int, word: WordState):
-    correct_attr = curses.color_pair(1)
-    wrong_attr = curses.color_pair(2)
     # draw target with correct/incorrect based on what was typed when submitted
+    target = word.target
     typed = word.typed
-    for i, ch in enumerate(word.target):
-        if i < len(typed) and typed[i] == ch:
-            stdscr.addch(y, x + i, ord(ch), correct_attr)
-        elif i < len(typed):
-            stdscr.addch(y, x + i, ord(ch), wrong_attr)
-        else:
-            stdscr.addch(y, x + i, ord(ch))
+    n = min(len(typed), len(target))
+    draw_marked(stdscr, y, x, word, 0, n)
+    if n < len(target):
+        stdscr.addnstr(y, x + n, target[n:], len(target) - n)
     # extra typed characters
-    if len(typed) > len(word.target):
-        for j in range(len(typed) - len(word.target)):
-            ch = typed[len(word.target) + j]
-            stdscr.addch(y, x + len(word.target) + j, ord(ch), wrong_attr)
+    extra = len(typed) - len(target)
+    if extra > 0:
+        stdscr.addnstr(y, x + len(target), typed[len(target):].decode("ascii"), extra, WRONG_ATTR)
 
 
 def run_curses(cfg: Config):
     def _main(stdscr):
         curses.curs_set(0)
+        _init_colors()
         stdscr.nodelay(True)
-        stdscr.timeout(50)  # refresh every 50ms for timer
+        stdscr.timeout(200)  # poll for the timer; render() skips frames where nothing changed
         session = TypingSession(cfg)
 
         while True:
@@ -301,12 +454,15 @@ def run_curses(cfg: Config):
                 session.tick()
                 continue
 
+            if ch == curses.KEY_RESIZE:
+                session._invalidate_layout()
+                continue
             if ch in (27,):
                 # ESC to quit
                 break
             if ch in (9,):
                 # TAB to restart
-                session = TypingSession(cfg)
+                session.reset()
                 continue
 
             if not session.is_finished():
@@ -315,7 +471,7 @@ def run_curses(cfg: Config):
             else:
                 # allow quick restart with any key except ESC
                 if ch not in (27,):
-                    session = TypingSession(cfg)
+                    session.reset()
 
     try:
         curses.wrapper(_main)
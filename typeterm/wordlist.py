@@ -30,7 +30,15 @@ def load_words_from_file(path: str | Path) -> list[str]:
     return uniq or WORDS
 
 
-def generate_words(n: int, *, seed: int | None = None, word_source: list[str] | None = None) -> list[str]:
+def generate_words(
+    n: int,
+    *,
+    seed: int | None = None,
+    word_source: list[str] | None = None,
+    rng: random.Random | None = None,
+) -> list[str]:
+    # pass rng to continue an existing sequence; otherwise a fresh one is seeded from seed
     pool = word_source if word_source else WORDS
-    rng = random.Random(seed)
-    return [rng.choice(pool) for _ in range(n)]
+    if rng is None:
+        rng = random.Random(seed)
+    return rng.choices(pool, k=n)